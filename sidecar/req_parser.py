@@ -12,6 +12,14 @@ Protocol:
             { "results": [...], "spacy_available": bool, "doc_type": "..." }
   stderr: log messages only
 
+  Large payloads may set "streaming": true, in which case results are
+  emitted as they are produced, one per line:
+            { "result": {...} }
+            ...
+            { "done": true, "spacy_available": bool, "doc_type": "..." }
+  Streaming results are unsorted (callers rank by "score"); duplicates are
+  flagged online against previously emitted results.
+
 This parser is tuned for requirement-like statements and includes:
   - modal requirements ("shall/must/will")
   - implicit constraints in structured mode/parameter lines
@@ -21,13 +29,14 @@ This parser is tuned for requirement-like statements and includes:
 
 from __future__ import annotations
 
-import hashlib
 import json
 import logging
 import re
 import sys
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from bisect import insort
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 # Force UTF-8 on Windows consoles.
@@ -44,6 +53,29 @@ logging.basicConfig(
     format="[req_parser] %(levelname)s %(message)s",
 )
 
+# Optional orjson (best-effort): Rust JSON codec, several times faster than
+# stdlib json on both directions and emits bytes directly for the stdout
+# buffer. The stdlib fallback shares one compact encoder built at import.
+try:
+    import orjson
+
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _json_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        return _json_encode(obj).encode("utf-8")
+
+    _loads = json.loads
+
+
+def _write_line(obj: Any) -> None:
+    out = sys.stdout.buffer
+    out.write(_dumps_bytes(obj))
+    out.write(b"\n")
+    out.flush()
+
 
 # Optional spaCy (best-effort).
 try:
@@ -58,6 +90,42 @@ except Exception as exc:
     logging.warning("spaCy unavailable, rule mode only: %s", exc)
 
 
+# Optional re2 (best-effort). The hot path is regex-dominated and none of the
+# patterns below need backtracking features, so the linear-time DFA engine is
+# a drop-in when installed (pip install google-re2). google-re2's compile()
+# rejects stdlib flag values, so every pattern carries its flags inline
+# ((?i) etc.); the probe below exercises the named-group/lastgroup surface
+# this module relies on and falls back to stdlib re if anything is off.
+#
+# re2's \w/\d/\b classes are ASCII-only while stdlib re is Unicode-aware,
+# so patterns whose result depends on those classes (tokenization, digit
+# gating, requirement-ID shapes, name generation) are pinned to stdlib re
+# below and never switch engines — output must not depend on which optional
+# package is installed. The keyword patterns left on _re are ASCII literals;
+# for those the engines only disagree on a boundary directly abutting a
+# non-ASCII word character (and on the fused measure group's \d), which is
+# accepted for the hot path.
+try:
+    import re2 as _re
+
+    _probe = _re.compile(r"(?i)\b(?P<word>shall)\b|(?P<semi>;)")
+    _match = _probe.search("The system SHALL")
+    if _match is None or _match.lastgroup != "word":
+        raise ImportError("re2 probe mismatch")
+    del _probe, _match
+    logging.info("re2 loaded OK, using DFA regex engine")
+except Exception:
+    _re = re
+
+
+# Optional BLAKE3 (best-effort). stable_id only keeps 12 hex chars, and blake3
+# is several times faster than SHA-1 on the short strings hashed here.
+try:
+    from blake3 import blake3 as _hash_fn
+except ImportError:
+    from hashlib import sha1 as _hash_fn
+
+
 @dataclass
 class ExtractConfig:
     use_spacy: bool = False
@@ -72,62 +140,159 @@ class ExtractConfig:
 CFG = ExtractConfig()
 
 
+@dataclass(slots=True)
+class Result:
+    """One extracted requirement candidate.
+
+    Slotted so large documents don't pay per-result dict overhead while the
+    list is sorted and deduplicated; rows are converted to dicts only at the
+    protocol boundary.
+    """
+
+    sentence: str
+    name: str
+    score: float
+    confidence: str
+    confidence_score: float
+    flags: List[str]
+    classification: str
+    req_id: str
+    section_title: str
+    section_ref: str
+    section_type: str
+    duplicate: bool = False
+    # Raw scoring inputs; the UI-facing score/confidence fields are derived
+    # from these in one finalize pass after collection.
+    raw_score: float = 0.0
+    threshold: float = 0.0
+
+
+_RESULT_FIELDS = tuple(
+    f.name for f in fields(Result) if f.name not in ("raw_score", "threshold")
+)
+
+
+def _result_to_dict(result: Result) -> Dict[str, Any]:
+    return {name: getattr(result, name) for name in _RESULT_FIELDS}
+
+
 # Core patterns.
-SHALL_RE = re.compile(r"\b(shall|must|will)\b", re.IGNORECASE)
+SHALL_RE = _re.compile(r"(?i)\b(shall|must|will)\b")
 MODAL_PATTERNS: List[Tuple[str, re.Pattern[str]]] = [
-    ("shall_not", re.compile(r"\bshall\s+not\b", re.IGNORECASE)),
-    ("must_not", re.compile(r"\bmust\s+not\b", re.IGNORECASE)),
-    ("may_not", re.compile(r"\bmay\s+not\b", re.IGNORECASE)),
-    ("shall", re.compile(r"\bshall\b", re.IGNORECASE)),
-    ("must", re.compile(r"\bmust\b", re.IGNORECASE)),
-    ("required", re.compile(r"\b(is|required)\s+to\b|\bis\s+required\s+to\b", re.IGNORECASE)),
-    ("should", re.compile(r"\bshould\b", re.IGNORECASE)),
-    ("will", re.compile(r"\bwill\b", re.IGNORECASE)),
+    ("shall_not", _re.compile(r"(?i)\bshall\s+not\b")),
+    ("must_not", _re.compile(r"(?i)\bmust\s+not\b")),
+    ("may_not", _re.compile(r"(?i)\bmay\s+not\b")),
+    ("shall", _re.compile(r"(?i)\bshall\b")),
+    ("must", _re.compile(r"(?i)\bmust\b")),
+    ("required", _re.compile(r"(?i)\b(is|required)\s+to\b|\bis\s+required\s+to\b")),
+    ("should", _re.compile(r"(?i)\bshould\b")),
+    ("will", _re.compile(r"(?i)\bwill\b")),
+]
+
+# Modal phrases as literals, in the same precedence order as MODAL_PATTERNS.
+# Sentences are whitespace-normalized before detection, so the \s+ in the
+# regex forms reduces to a single space here.
+_MODAL_PHRASES: List[Tuple[str, str]] = [
+    ("shall_not", "shall not"),
+    ("must_not", "must not"),
+    ("may_not", "may not"),
+    ("shall", "shall"),
+    ("must", "must"),
+    ("required", "is to"),
+    ("required", "required to"),
+    ("should", "should"),
+    ("will", "will"),
 ]
 
+# Optional Aho-Corasick automaton (best-effort): one linear scan over the
+# sentence instead of up to eight regex searches. Falls back to the regex
+# loop when pyahocorasick is not installed.
+try:
+    import ahocorasick
+
+    _MODAL_AUTOMATON = ahocorasick.Automaton()
+    for _priority, (_name, _phrase) in enumerate(_MODAL_PHRASES):
+        _MODAL_AUTOMATON.add_word(_phrase, (_priority, _name, len(_phrase)))
+    _MODAL_AUTOMATON.make_automaton()
+except ImportError:
+    _MODAL_AUTOMATON = None
+
+# Unicode-aware stdlib engine (see the re2 tier comment above).
 REQ_ID_PREFIX_RE = re.compile(
-    r"\b(?P<prefix>REQ|SR|SWR|SYS|SS|SRS|FR|PR|APSDS)"
+    r"(?i)\b(?P<prefix>REQ|SR|SWR|SYS|SS|SRS|FR|PR|APSDS)"
     r"(?P<sep>[-_ ]?)"
     r"(?P<num>\d{1,6}(?:\.\d{1,6})*)\b",
-    re.IGNORECASE,
 )
 
 REQ_ID_COMPOSITE_RE = re.compile(
-    r"\b(?P<sys>[A-Z]{2,12})[-_ ](?P<prefix>REQ|SR|SWR|SYS|SS|SRS|FR|PR)"
+    r"(?i)\b(?P<sys>[A-Z]{2,12})[-_ ](?P<prefix>REQ|SR|SWR|SYS|SS|SRS|FR|PR)"
     r"[-_ ](?P<num>\d{1,6}(?:\.\d{1,6})*)\b",
-    re.IGNORECASE,
-)
-
-MEASURE_RE = re.compile(
-    r"(\bwithin\s+\d+(\.\d+)?\s*(ms|s|sec|seconds|minutes|hours)\b|<=|>=|<|>|±|"
-    r"\baccuracy\b|\blatency\b|\bthroughput\b|\brange\b|\bmtbf\b|\bfps\b|\bhz\b|"
-    r"\bknots\b|\bm/s\b|\btops\b|\bgb\b|\bms\b|\bdb\b|\bkm\b|\bmeters?\b|\b°c\b)",
-    re.IGNORECASE,
-)
-NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b", re.IGNORECASE)
-HEDGE_RE = re.compile(r"\b(as appropriate|as needed|if possible|where feasible|etc\.)\b", re.IGNORECASE)
-DEFINITION_RE = re.compile(r"\b(denotes|means|is defined as|refers to)\b", re.IGNORECASE)
-META_DOC_RE = re.compile(r"\b(this document|this section|this specification|this sow|this statement)\b", re.IGNORECASE)
-
-VERIFY_RE = re.compile(
-    r"\b(verify|verification|validated|validation|test|analysis|inspection|demonstration)\b",
-    re.IGNORECASE,
-)
-INTERFACE_RE = re.compile(
-    r"\b(interface|interoperate|compatible with|integrate with|connect to)\b",
-    re.IGNORECASE,
 )
 
-SUBJECT_SYSTEM_RE = re.compile(
-    r"\b(the system|the software|the device|the platform|the application|the subsystem)\b",
-    re.IGNORECASE,
-)
-SUBJECT_CONTRACT_RE = re.compile(
-    r"\b(the contractor|the vendor|the offeror|the supplier|the provider)\b",
-    re.IGNORECASE,
-)
-SUBJECT_COMPONENT_RE = re.compile(
-    r"\b("
+DEFINITION_RE = _re.compile(r"(?i)\b(denotes|means|is defined as|refers to)\b")
+META_DOC_RE = _re.compile(r"(?i)\b(this document|this section|this specification|this sow|this statement)\b")
+
+STRUCTURED_LINE_RE = _re.compile(r"^([A-Z][A-Za-z0-9/\- ]{2,}?)\s*(\([^)]+\))?\s*[:\-–—]\s+.+\S$")
+TABLE_FIGURE_TITLE_RE = re.compile(r"(?i)^\s*(table|figure)\s+\d+([.-]\d+)*\s*[:\-–—]")
+MODE_SECTION_RE = _re.compile(r"(?i)\b(emcon|mode|modes|operating mode)\b")
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+# Sentence feature bits.  classify/score_modal/score_non_modal used to run a
+# dozen independent regexes over each sentence; the sentence is now tokenized
+# once, single-word vocabularies are dict lookups on the tokens, and only the
+# phrase/symbol/anchored patterns still go through one fused regex pass. The
+# consumers test bits.
+_F_MEASURE = 1 << 0
+_F_NUMBER = 1 << 1
+_F_HEDGE = 1 << 2
+_F_VERIFY = 1 << 3
+_F_INTERFACE = 1 << 4
+_F_SUBJ_SYSTEM = 1 << 5
+_F_SUBJ_CONTRACT = 1 << 6
+_F_SUBJ_COMPONENT = 1 << 7
+_F_CONSTRAINT = 1 << 8
+_F_MODE_WORD = 1 << 9
+_F_PROCESS = 1 << 10
+_F_NOISE = 1 << 11
+
+_F_SUBJ_ANY = _F_SUBJ_SYSTEM | _F_SUBJ_CONTRACT | _F_SUBJ_COMPONENT
+
+# Single-word vocabularies, resolved by token lookup instead of regex scans.
+# "latency"/"accuracy" historically matched both the measure and constraint
+# vocabularies, so they map to both bits.
+_WORD_BITS: Dict[str, int] = {}
+for _words, _bit in (
+    (("throughput", "range", "mtbf", "fps", "hz", "knots", "tops", "gb", "ms",
+      "db", "km", "meter", "meters"), _F_MEASURE),
+    (("latency", "accuracy"), _F_MEASURE | _F_CONSTRAINT),
+    (("threshold", "objective", "parameter", "constraint", "limit", "rate",
+      "frequency"), _F_CONSTRAINT),
+    (("verify", "verification", "validated", "validation", "test", "analysis",
+      "inspection", "demonstration"), _F_VERIFY),
+    (("interface", "interoperate"), _F_INTERFACE),
+    (("enabled", "disabled", "active", "inactive", "autonomous", "streaming",
+      "telemetry", "video", "radio", "rf", "emission", "link"), _F_MODE_WORD),
+    (("cor", "personnel", "staff", "attend", "cdrl", "did"), _F_PROCESS),
+):
+    for _word in _words:
+        _WORD_BITS[_word] = _WORD_BITS.get(_word, 0) | _bit
+
+# Multi-word phrases, symbols, and anchored prefixes that token lookup cannot
+# express without losing word-boundary semantics. The process vocabulary is
+# scanned separately below: its phrases can end in "the" ("notify the",
+# "document the") and a non-overlapping fused scan would consume the "the"
+# that a following subject phrase needs.
+_FEATURE_RE = _re.compile(
+    r"(?i)(?P<noise>^(note[:\s]|this\s|it\s+must\s+be\s+noted|as\s+noted|see\s+|refer\s+to|"
+    r"figure\s+|table\s+|section\s+|appendix\s+))"
+    r"|(?P<measure>\bwithin\s+\d+(\.\d+)?\s*(ms|s|sec|seconds|minutes|hours)\b|<=|>=|<|>|±|"
+    r"\bm/s\b|\b°c\b)"
+    r"|(?P<hedge>\b(as appropriate|as needed|if possible|where feasible|etc\.)\b)"
+    r"|(?P<interface>\b(compatible with|integrate with|connect to)\b)"
+    r"|(?P<subj_sys>\b(the system|the software|the device|the platform|the application|the subsystem)\b)"
+    r"|(?P<subj_contract>\b(the contractor|the vendor|the offeror|the supplier|the provider)\b)"
+    r"|(?P<subj_comp>\b("
     r"(navigation|communications|compute|processing|vision|payload|sensor|eo|ir|eo/ir|rf|emcon)\s*"
     r"(subsystem|system|module|pipeline|algorithm|payload)"
     r"|the\s+(gcs|ground\s+control\s+station|ground\s+station)"
@@ -135,79 +300,118 @@ SUBJECT_COMPONENT_RE = re.compile(
     r"|the\s+threat\s+detection\s+algorithm"
     r"|the\s+vision\s+processing\s+pipeline"
     r"|the\s+onboard\s+edge\s+ai\s+accelerator"
-    r")\b",
-    re.IGNORECASE,
+    r")\b)"
 )
 
-CONSTRAINT_WORD_RE = re.compile(
-    r"\b(threshold|objective|parameter|constraint|limit|rate|frequency|latency|accuracy)\b",
-    re.IGNORECASE,
-)
-STRUCTURED_LINE_RE = re.compile(r"^([A-Z][A-Za-z0-9/\- ]{2,}?)\s*(\([^)]+\))?\s*[:\-–—]\s+.+\S$")
-TABLE_FIGURE_TITLE_RE = re.compile(r"^\s*(table|figure)\s+\d+([.-]\d+)*\s*[:\-–—]", re.IGNORECASE)
-MODE_SECTION_RE = re.compile(r"\b(emcon|mode|modes|operating mode)\b", re.IGNORECASE)
-MODE_WORD_RE = re.compile(
-    r"\b(enabled|disabled|active|inactive|autonomous|streaming|telemetry|video|radio|rf|emission|link)\b",
-    re.IGNORECASE,
+_PROCESS_PHRASE_RE = _re.compile(
+    r"(?i)\b(program\s+manager|contracting\s+officer|"
+    r"submit\s+(a\s+)?(report|plan|schedule)|coordinate\s+with|notify\s+the|document\s+the|"
+    r"provide\s+a\s+(report|plan|schedule|briefing)|data\s+item\s+description)\b",
 )
 
-PROCESS_WORDS = re.compile(
-    r"\b(program\s+manager|contracting\s+officer|cor\b|personnel|staff\b|attend\b|"
-    r"submit\s+(a\s+)?(report|plan|schedule)|coordinate\s+with|notify\s+the|document\s+the|"
-    r"provide\s+a\s+(report|plan|schedule|briefing)|cdrl|data\s+item\s+description|did\b)\b",
-    re.IGNORECASE,
+_FEATURE_BITS = {
+    "noise": _F_NOISE,
+    "measure": _F_MEASURE,
+    "hedge": _F_HEDGE,
+    "interface": _F_INTERFACE,
+    "subj_sys": _F_SUBJ_SYSTEM,
+    "subj_contract": _F_SUBJ_CONTRACT,
+    "subj_comp": _F_SUBJ_COMPONENT,
+}
+
+
+def feature_flags(text: str) -> int:
+    flags = 0
+    for tok in _WORD_RE.findall(text.lower()):
+        if tok.isdigit():
+            flags |= _F_NUMBER
+        else:
+            flags |= _WORD_BITS.get(tok, 0)
+    for m in _FEATURE_RE.finditer(text):
+        flags |= _FEATURE_BITS[m.lastgroup]
+    if _PROCESS_PHRASE_RE.search(text):
+        flags |= _F_PROCESS
+    return flags
+
+# Name-generation patterns (used by generate_name; hoisted so they compile once).
+_GN_TRAILING_STOP = _re.compile(
+    r"(?i)^(a|an|the|of|in|on|at|to|for|with|within|from|into|"
+    r"by|between|and|or|that|which|its|their|this|these|those|"
+    r"upon|when|if|as|during|under|over|above|below|per|"
+    r"automatically|immediately|properly|correctly|successfully)$",
+)
+_GN_LEADING_ART = _re.compile(r"(?i)^(a|an|the)\s+")
+_GN_ADVERB_FILLER = _re.compile(
+    r"(?i)\b(automatically|immediately|properly|correctly|successfully|"
+    r"securely|efficiently|seamlessly|dynamically|continuously)\b\s*",
+)
+_GN_NUMBER_UNIT_RE = re.compile(
+    r"(?i)\b\d+(?:[.,]\d+)?\s*(?:ms|s|sec(?:ond)?s?|min(?:ute)?s?|hours?|"
+    r"fps|hz|mbps|gbps|kb|mb|gb|%|percent|degrees?|times?|x\b)?",
 )
-NOISE_RE = re.compile(
-    r"^(note[:\s]|this\s|it\s+must\s+be\s+noted|as\s+noted|see\s+|refer\s+to|"
-    r"figure\s+|table\s+|section\s+|appendix\s+)",
-    re.IGNORECASE,
+_GN_COND_RE = _re.compile(r"(?i)^(?:when|if|upon|after|once)\b[^,]{3,100},\s*")
+_GN_GENERIC_SUBJ = _re.compile(
+    r"(?i)^(?:the\s+(?:system|device|software|application|platform|tool|"
+    r"module|component|interface|server|client|database|product|solution)|it)\s+"
+    r"(?:shall|must|should|will|required\s+to)\s+",
+)
+_GN_DOMAIN_SUBJ = re.compile(
+    r"(?i)^((?:the\s+)?[\w][\w\s\-]{1,35}?)\s+"
+    r"(?:shall|must|should|will|required\s+to)\s+",
+)
+_GN_MID_MODAL_RE = _re.compile(r"(?i)\b(?:shall|must|should|will)\b\s*")
+_GN_COORD = _re.compile(r"(?i)^(and|or|but|nor)$")
+_GN_UNIT_RE = _re.compile(
+    r"(?i)^(?:ms|sec(?:ond)?s?|min(?:ute)?s?|hours?|fps|hz|"
+    r"mbps|gbps|kb|mb|gb|%|percent|degrees?|times?)$",
 )
 
 # Definitional boilerplate patterns.
 META_PATTERNS = [
-    re.compile(r"\bshall\b.{0,40}\bdenotes?\b", re.IGNORECASE),
-    re.compile(r"\bshall\b.{0,30}\b(indicates?|means?|refers?\s+to)\b", re.IGNORECASE),
-    re.compile(
-        r"\bshall\s+satisfy\s+all\s+requirements?\s+(identified|listed|contained|specified|described|in\s+this)",
-        re.IGNORECASE,
-    ),
-    re.compile(r"\ball\s+requirements?\s+(in|of|within)\s+this\b", re.IGNORECASE),
-    re.compile(r"\brequirements?\s+shall\s+be\s+(verified|validated|tested)\s+by\b", re.IGNORECASE),
-    re.compile(
-        r"^(this\s+(section|document|table|figure|paragraph)\s+(defines?|describes?|lists?|specifies?|contains?|provides?))",
-        re.IGNORECASE,
-    ),
+    _re.compile(r"(?i)\bshall\b.{0,40}\bdenotes?\b"),
+    _re.compile(r"(?i)\bshall\b.{0,30}\b(indicates?|means?|refers?\s+to)\b"),
+    _re.compile(
+        r"(?i)\bshall\s+satisfy\s+all\s+requirements?\s+(identified|listed|contained|specified|described|in\s+this)",
+        ),
+    _re.compile(r"(?i)\ball\s+requirements?\s+(in|of|within)\s+this\b"),
+    _re.compile(r"(?i)\brequirements?\s+shall\s+be\s+(verified|validated|tested)\s+by\b"),
+    _re.compile(
+        r"(?i)^(this\s+(section|document|table|figure|paragraph)\s+(defines?|describes?|lists?|specifies?|contains?|provides?))",
+        ),
 ]
 
 
+_CLEAN_HEADER_RE = _re.compile(
+    r"(?i)^(requirement|req|context|note|rationale|description|title|id|ref)\s*[:\-]\s*",
+)
+_CLEAN_LEADING_ID_RE = re.compile(
+    r"(?i)^(REQ|SR|SWR|SYS|SS|SRS|FR|PR|APSDS)[-_ ]\d+(\.\d+)?[\s:\-]+",
+)
+_CLEAN_CONTEXT_TAIL_RE = _re.compile(r"(?i)\s*context\s*:\s*.+$")
+
+
 def normalize_ws(text: str) -> str:
-    text = text.replace("\u00a0", " ")
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split() with no argument splits on any run of Unicode whitespace
+    # (including NBSP), so this is the old regex collapse done entirely in C.
+    return " ".join(text.split())
 
 
 def clean_sentence(text: str) -> str:
     text = normalize_ws(text)
     if not text:
         return ""
-    text = re.sub(
-        r"^(requirement|req|context|note|rationale|description|title|id|ref)\s*[:\-]\s*",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
+    text = _CLEAN_HEADER_RE.sub("", text, 1)
     # Only strip leading IDs with requirement-like prefixes.
-    text = re.sub(
-        r"^(REQ|SR|SWR|SYS|SS|SRS|FR|PR|APSDS)[-_ ]\d+(\.\d+)?[\s:\-]+",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
-    text = re.sub(r"\s*context\s*:\s*.+$", "", text, flags=re.IGNORECASE)
+    text = _CLEAN_LEADING_ID_RE.sub("", text, 1)
+    text = _CLEAN_CONTEXT_TAIL_RE.sub("", text, 1)
     return text.strip()
 
 
-def extract_req_id(text: str, cfg: ExtractConfig) -> Optional[str]:
-    text = normalize_ws(text)
+_HAS_DIGIT_RE = re.compile(r"\d")
+
+
+@lru_cache(maxsize=4096)
+def _extract_req_id_cached(text: str, id_prefixes: Tuple[str, ...]) -> Optional[str]:
     m2 = REQ_ID_COMPOSITE_RE.search(text)
     if m2:
         sys_name = m2.group("sys").upper()
@@ -218,20 +422,55 @@ def extract_req_id(text: str, cfg: ExtractConfig) -> Optional[str]:
     m = REQ_ID_PREFIX_RE.search(text)
     if m:
         prefix = m.group("prefix").upper()
-        if prefix not in {p.upper() for p in cfg.id_prefixes}:
+        if prefix not in id_prefixes:
             return None
         return f"{prefix}-{m.group('num')}"
 
     return None
 
 
+def extract_req_id(text: str, cfg: ExtractConfig) -> Optional[str]:
+    text = normalize_ws(text)
+    # Every ID form contains digits; most sentences contain none, and this
+    # one C-level scan skips both ID regexes for them. Accepted sentences
+    # are scored and then re-queried for their ID, so the lookup itself is
+    # memoized (keyed on the configured prefixes, since CFG is mutable).
+    if _HAS_DIGIT_RE.search(text) is None:
+        return None
+    return _extract_req_id_cached(text, tuple(p.upper() for p in cfg.id_prefixes))
+
+
 def stable_id(text: str, section_title: str, section_ref: str) -> str:
     base = f"{section_title} | {section_ref} :: {normalize_ws(text)}"
-    digest = hashlib.sha1(base.encode("utf-8")).hexdigest()[:12]
+    digest = _hash_fn(base.encode("utf-8")).hexdigest()[:12]
     return f"REQ-{digest}"
 
 
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
 def detect_modality(text: str, cfg: ExtractConfig) -> Optional[str]:
+    if _MODAL_AUTOMATON is not None:
+        lower = text.lower()
+        last = len(lower) - 1
+        best: Optional[Tuple[int, str]] = None
+        for end, (priority, name, length) in _MODAL_AUTOMATON.iter(lower):
+            if name == "will" and not cfg.treat_will_as_normative:
+                continue
+            if best is not None and priority >= best[0]:
+                continue
+            # Reproduce the \b anchors the regex forms had.
+            start = end - length + 1
+            if start > 0 and _is_word_char(lower[start - 1]):
+                continue
+            if end < last and _is_word_char(lower[end + 1]):
+                continue
+            best = (priority, name)
+            if priority == 0:
+                break
+        return best[1] if best else None
+
     for name, rx in MODAL_PATTERNS:
         if name == "will" and not cfg.treat_will_as_normative:
             continue
@@ -240,29 +479,48 @@ def detect_modality(text: str, cfg: ExtractConfig) -> Optional[str]:
     return None
 
 
+_SPLIT_SCAN_RE = _re.compile(r"(?i)\b(?P<modal>shall|must|will)\b|(?P<semi>;)|\b(?P<conj>and)\b")
+
+
 def split_compound(text: str) -> List[str]:
-    modals = list(SHALL_RE.finditer(text))
+    # One scan collects every event the decision tree below needs, instead of
+    # separate modal/semicolon/"and" passes over overlapping substrings.
+    modals: List[Tuple[int, int]] = []
+    semis: List[int] = []
+    conjs: List[Tuple[int, int]] = []
+    for m in _SPLIT_SCAN_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == "modal":
+            modals.append((m.start(), m.end()))
+        elif kind == "semi":
+            semis.append(m.start())
+        else:
+            conjs.append((m.start(), m.end()))
+
     if len(modals) < 2:
         return [text]
 
-    between_start = modals[0].end()
-    between_end = modals[1].start()
-    between = text[between_start:between_end]
+    between_start = modals[0][1]
+    between_end = modals[1][0]
 
-    semi = text.find(";", between_start, between_end)
+    semi = next((pos for pos in semis if between_start <= pos < between_end), -1)
     if semi != -1:
         part1 = text[:semi].strip().rstrip(",; ")
         part2 = text[semi + 1 :].strip()
         if len(part1) > 15 and len(part2) > 15:
             return [part1, part2]
 
-    and_match = re.search(r"\band\b", between, re.IGNORECASE)
-    if and_match:
-        split_pos = between_start + and_match.start()
-        part1 = text[:split_pos].strip().rstrip(", ")
-        part2 = text[split_pos + len(and_match.group()) :].strip()
-        if len(part1) > 15 and len(part2) > 15 and SHALL_RE.search(part2):
+    for conj_start, conj_end in conjs:
+        if conj_start < between_start:
+            continue
+        if conj_end > between_end:
+            break
+        part1 = text[:conj_start].strip().rstrip(", ")
+        part2 = text[conj_end:].strip()
+        if len(part1) > 15 and len(part2) > 15 and any(start >= conj_end for start, _ in modals):
             return [part1, part2]
+        # Like the old search, only the first "and" between the modals counts.
+        break
 
     return [text]
 
@@ -273,7 +531,26 @@ def is_definitional(text: str) -> bool:
     return bool(re.search(r"\bshall\b|\bmust\b|\bshould\b|\bwill\b", text, re.IGNORECASE))
 
 
+# Every META_PATTERNS alternative requires one of these substrings, so a
+# cheap C-level "in" gate skips all six scans for ordinary sentences.
+_META_TRIGGERS = (
+    "denote",
+    "indicat",
+    "mean",
+    "refer",
+    "requirement",
+    "this section",
+    "this document",
+    "this table",
+    "this figure",
+    "this paragraph",
+)
+
+
 def is_meta_statement(text: str) -> bool:
+    lower = text.lower()
+    if not any(trigger in lower for trigger in _META_TRIGGERS):
+        return False
     for pattern in META_PATTERNS:
         if pattern.search(text):
             return True
@@ -284,151 +561,281 @@ def is_meta_document_statement(text: str) -> bool:
     return bool(META_DOC_RE.search(text))
 
 
-def classify(text: str, context: Dict[str, Any]) -> str:
+def classify(flags: int, context: Dict[str, Any]) -> str:
     section_title = str(context.get("section_title", ""))
     in_mode_region = bool(MODE_SECTION_RE.search(section_title))
 
-    if SUBJECT_CONTRACT_RE.search(text):
+    if flags & _F_SUBJ_CONTRACT:
         return "contractual"
 
-    if SUBJECT_SYSTEM_RE.search(text) or SUBJECT_COMPONENT_RE.search(text):
-        if INTERFACE_RE.search(text):
+    if flags & (_F_SUBJ_SYSTEM | _F_SUBJ_COMPONENT):
+        if flags & _F_INTERFACE:
             return "interface"
-        if VERIFY_RE.search(text):
+        if flags & _F_VERIFY:
             return "verification"
-        if MEASURE_RE.search(text) or CONSTRAINT_WORD_RE.search(text):
+        if flags & (_F_MEASURE | _F_CONSTRAINT):
             return "constraint"
         return "system"
 
-    if INTERFACE_RE.search(text):
+    if flags & _F_INTERFACE:
         return "interface"
-    if VERIFY_RE.search(text):
+    if flags & _F_VERIFY:
         return "verification"
-    if in_mode_region and MODE_WORD_RE.search(text):
+    if in_mode_region and flags & _F_MODE_WORD:
         return "constraint"
-    if MEASURE_RE.search(text) or CONSTRAINT_WORD_RE.search(text):
+    if flags & (_F_MEASURE | _F_CONSTRAINT):
         return "constraint"
 
     return "unknown"
 
 
-def score_modal(text: str, modality: str, context: Dict[str, Any], cfg: ExtractConfig) -> Tuple[float, Dict[str, float]]:
+def spacy_features(parts: List[str]) -> List[Tuple[bool, bool]]:
+    """Batch all parts through spaCy once and return (has_nsubj, has_md) per part.
+
+    Batching through nlp.pipe with the unused components disabled is far
+    cheaper than running the full pipeline one sentence at a time.
+    """
+    disable = [p for p in ("ner", "lemmatizer", "attribute_ruler") if p in _NLP.pipe_names]
+    docs = _NLP.pipe(parts, batch_size=64, disable=disable)
+    return [
+        (
+            any(token.dep_ == "nsubj" for token in doc),
+            any(token.tag_ == "MD" for token in doc),
+        )
+        for doc in docs
+    ]
+
+
+# Scoring feature names, alphabetical; bit i of a scorer's feature mask is
+# _SCORE_FEATURE_NAMES[i].
+_SCORE_FEATURE_NAMES: Tuple[str, ...] = (
+    "constraint_word",
+    "good_length",
+    "has_subject",
+    "has_subject_phrase",
+    "hedge_penalty",
+    "measurable",
+    "medium_modality",
+    "modal_pos_confirmed",
+    "mode_section_boost",
+    "mode_section_context",
+    "noise_prefix",
+    "process_language",
+    "req_id",
+    "strong_modality",
+    "structured_line",
+    "too_long",
+    "too_short",
+    "verification_cue",
+    "weak_modality",
+)
+(
+    _OF_CONSTRAINT_WORD,
+    _OF_GOOD_LENGTH,
+    _OF_HAS_SUBJECT,
+    _OF_HAS_SUBJECT_PHRASE,
+    _OF_HEDGE_PENALTY,
+    _OF_MEASURABLE,
+    _OF_MEDIUM_MODALITY,
+    _OF_MODAL_POS_CONFIRMED,
+    _OF_MODE_SECTION_BOOST,
+    _OF_MODE_SECTION_CONTEXT,
+    _OF_NOISE_PREFIX,
+    _OF_PROCESS_LANGUAGE,
+    _OF_REQ_ID,
+    _OF_STRONG_MODALITY,
+    _OF_STRUCTURED_LINE,
+    _OF_TOO_LONG,
+    _OF_TOO_SHORT,
+    _OF_VERIFICATION_CUE,
+    _OF_WEAK_MODALITY,
+) = (1 << i for i in range(len(_SCORE_FEATURE_NAMES)))
+
+_MODALITY_STRONG = 1
+_MODALITY_MEDIUM = 2
+_MODALITY_WEAK = 3
+_MODALITY_KIND = {
+    "shall": _MODALITY_STRONG,
+    "shall_not": _MODALITY_STRONG,
+    "must": _MODALITY_STRONG,
+    "must_not": _MODALITY_STRONG,
+    "required": _MODALITY_STRONG,
+    "should": _MODALITY_MEDIUM,
+    "may_not": _MODALITY_MEDIUM,
+    "will": _MODALITY_WEAK,
+}
+
+
+def _flags_from_bits(feat_bits: int, extra: Optional[str] = None) -> List[str]:
+    # _SCORE_FEATURE_NAMES is alphabetical, so the reconstructed list is
+    # already sorted; a single extra flag is merged into position.
+    flag_list = [
+        name for i, name in enumerate(_SCORE_FEATURE_NAMES) if feat_bits >> i & 1
+    ]
+    if extra is not None:
+        insort(flag_list, extra)
+    return flag_list
+
+
+def _score_modal_core(
+    flags: int,
+    modality_kind: int,
+    word_count: int,
+    has_req_id: bool,
+    in_mode_section: bool,
+    has_nsubj: bool,
+    has_md: bool,
+) -> Tuple[float, int]:
+    """Pure scalar scoring over precomputed inputs; no text access."""
     score = 0.0
-    feats: Dict[str, float] = {}
+    feat_bits = 0
 
-    if modality in ("shall", "shall_not", "must", "must_not", "required"):
+    if modality_kind == _MODALITY_STRONG:
         score += 3.0
-        feats["strong_modality"] = 1.0
-    elif modality in ("should", "may_not"):
+        feat_bits |= _OF_STRONG_MODALITY
+    elif modality_kind == _MODALITY_MEDIUM:
         score += 1.5
-        feats["medium_modality"] = 1.0
-    elif modality == "will":
+        feat_bits |= _OF_MEDIUM_MODALITY
+    elif modality_kind == _MODALITY_WEAK:
         score += 0.5
-        feats["weak_modality"] = 1.0
+        feat_bits |= _OF_WEAK_MODALITY
 
-    if SUBJECT_SYSTEM_RE.search(text) or SUBJECT_CONTRACT_RE.search(text) or SUBJECT_COMPONENT_RE.search(text):
+    if flags & _F_SUBJ_ANY:
         score += 1.0
-        feats["has_subject_phrase"] = 1.0
+        feat_bits |= _OF_HAS_SUBJECT_PHRASE
 
-    if MEASURE_RE.search(text) or NUMBER_RE.search(text):
+    if flags & (_F_MEASURE | _F_NUMBER):
         score += 2.0
-        feats["measurable"] = 1.0
+        feat_bits |= _OF_MEASURABLE
 
-    if VERIFY_RE.search(text):
+    if flags & _F_VERIFY:
         score += 0.5
-        feats["verification_cue"] = 1.0
+        feat_bits |= _OF_VERIFICATION_CUE
 
-    if HEDGE_RE.search(text):
+    if flags & _F_HEDGE:
         score -= 1.5
-        feats["hedge_penalty"] = 1.0
+        feat_bits |= _OF_HEDGE_PENALTY
 
-    if PROCESS_WORDS.search(text):
+    if flags & _F_PROCESS:
         score -= 0.8
-        feats["process_language"] = 1.0
+        feat_bits |= _OF_PROCESS_LANGUAGE
 
-    if NOISE_RE.match(text):
+    if flags & _F_NOISE:
         score -= 1.0
-        feats["noise_prefix"] = 1.0
+        feat_bits |= _OF_NOISE_PREFIX
 
-    if extract_req_id(text, cfg):
+    if has_req_id:
         score += 1.0
-        feats["req_id"] = 1.0
+        feat_bits |= _OF_REQ_ID
 
-    section_title = str(context.get("section_title", ""))
-    if section_title and MODE_SECTION_RE.search(section_title):
+    if in_mode_section:
         score += 0.4
-        feats["mode_section_context"] = 1.0
+        feat_bits |= _OF_MODE_SECTION_CONTEXT
 
-    words = text.split()
-    if 6 <= len(words) <= 45:
+    if 6 <= word_count <= 45:
         score += 0.5
-        feats["good_length"] = 1.0
-    elif len(words) > 80:
+        feat_bits |= _OF_GOOD_LENGTH
+    elif word_count > 80:
         score -= 0.6
-        feats["too_long"] = 1.0
-    elif len(words) < 5:
+        feat_bits |= _OF_TOO_LONG
+    elif word_count < 5:
         score -= 0.8
-        feats["too_short"] = 1.0
+        feat_bits |= _OF_TOO_SHORT
 
-    if SPACY_OK and _NLP is not None and cfg.use_spacy:
-        doc = _NLP(text)
-        if any(token.dep_ == "nsubj" for token in doc):
-            score += 0.4
-            feats["has_subject"] = 1.0
-        if any(token.tag_ == "MD" for token in doc):
-            score += 0.2
-            feats["modal_pos_confirmed"] = 1.0
+    if has_nsubj:
+        score += 0.4
+        feat_bits |= _OF_HAS_SUBJECT
+    if has_md:
+        score += 0.2
+        feat_bits |= _OF_MODAL_POS_CONFIRMED
 
-    return score, feats
+    return score, feat_bits
 
 
-def score_non_modal(text: str, context: Dict[str, Any]) -> Tuple[float, Dict[str, float]]:
+def _score_non_modal_core(flags: int, structured: bool, mode_boost: bool) -> Tuple[float, int]:
+    """Pure scalar scoring over precomputed inputs; no text access."""
     score = 0.0
-    feats: Dict[str, float] = {}
+    feat_bits = 0
 
-    if STRUCTURED_LINE_RE.match(text):
+    if structured:
         score += 2.0
-        feats["structured_line"] = 1.0
+        feat_bits |= _OF_STRUCTURED_LINE
 
-    if MEASURE_RE.search(text) or NUMBER_RE.search(text):
+    if flags & (_F_MEASURE | _F_NUMBER):
         score += 2.5
-        feats["measurable"] = 1.0
+        feat_bits |= _OF_MEASURABLE
 
-    if CONSTRAINT_WORD_RE.search(text):
+    if flags & _F_CONSTRAINT:
         score += 1.0
-        feats["constraint_word"] = 1.0
+        feat_bits |= _OF_CONSTRAINT_WORD
 
-    section_title = str(context.get("section_title", ""))
-    if MODE_SECTION_RE.search(section_title) and MODE_WORD_RE.search(text):
+    if mode_boost:
         score += 1.5
-        feats["mode_section_boost"] = 1.0
+        feat_bits |= _OF_MODE_SECTION_BOOST
 
-    if HEDGE_RE.search(text):
+    if flags & _F_HEDGE:
         score -= 1.0
-        feats["hedge_penalty"] = 1.0
+        feat_bits |= _OF_HEDGE_PENALTY
 
-    return score, feats
+    return score, feat_bits
 
 
-def score_to_confidence(score: float, threshold: float) -> float:
-    # Baseline confidence at threshold, then smooth increase above threshold.
-    margin = score - threshold
-    conf = 0.20 + 0.10 * max(0.0, margin)
-    return max(0.0, min(1.0, conf))
+def score_modal(
+    text: str,
+    flags: int,
+    modality: str,
+    context: Dict[str, Any],
+    cfg: ExtractConfig,
+    nlp_feats: Optional[Tuple[bool, bool]] = None,
+) -> Tuple[float, int]:
+    section_title = str(context.get("section_title", ""))
+    has_nsubj, has_md = nlp_feats if nlp_feats is not None else (False, False)
+    score, feat_bits = _score_modal_core(
+        flags,
+        _MODALITY_KIND.get(modality, 0),
+        len(text.split()),
+        extract_req_id(text, cfg) is not None,
+        bool(section_title and MODE_SECTION_RE.search(section_title)),
+        has_nsubj,
+        has_md,
+    )
+    return score, feat_bits
+
+
+def score_non_modal(text: str, flags: int, context: Dict[str, Any]) -> Tuple[float, int]:
+    section_title = str(context.get("section_title", ""))
+    score, feat_bits = _score_non_modal_core(
+        flags,
+        bool(STRUCTURED_LINE_RE.match(text)),
+        bool(MODE_SECTION_RE.search(section_title) and flags & _F_MODE_WORD),
+    )
+    return score, feat_bits
+
 
+def finalize_result(result: Result) -> None:
+    """Derive the UI-facing score fields from raw_score/threshold in place.
+
+    One fused pass instead of separate confidence/label/normalize calls per
+    result. A vectorized (numpy) variant was measured and rejected: casting
+    float64 results back to Python floats for JSON output costs more than
+    the per-result arithmetic saved at this payload scale.
+    """
+    margin = result.raw_score - result.threshold
 
-def confidence_label(score: float, threshold: float) -> str:
-    if score >= threshold + 2.0:
-        return "high"
-    if score >= threshold:
-        return "medium"
-    return "low"
+    # Baseline confidence at threshold, then smooth increase above threshold.
+    conf = 0.20 + 0.10 * margin if margin > 0.0 else 0.20
+    result.confidence_score = round(conf if conf < 1.0 else 1.0, 3)
 
+    if margin >= 2.0:
+        result.confidence = "high"
+    elif margin >= 0.0:
+        result.confidence = "medium"
+    else:
+        result.confidence = "low"
 
-def normalize_ui_score(score: float, threshold: float) -> float:
     # Map around threshold into [0, 1] while preserving rank.
-    normalized = (score - (threshold - 2.0)) / 5.0
-    return max(0.0, min(1.0, round(normalized, 3)))
+    normalized = round((margin + 2.0) / 5.0, 3)
+    result.score = max(0.0, min(1.0, normalized))
 
 
 def generate_name(text: str, modality: str) -> str:
@@ -445,31 +852,10 @@ def generate_name(text: str, modality: str) -> str:
     5. Trim trailing connectors, prepositions, and articles.
     6. Cap at 6 words, Title Case.
     """
-    _TRAILING_STOP = re.compile(
-        r"^(a|an|the|of|in|on|at|to|for|with|within|from|into|"
-        r"by|between|and|or|that|which|its|their|this|these|those|"
-        r"upon|when|if|as|during|under|over|above|below|per|"
-        r"automatically|immediately|properly|correctly|successfully)$",
-        re.IGNORECASE,
-    )
-    _LEADING_ART = re.compile(r"^(a|an|the)\s+", re.IGNORECASE)
-    _ADVERB_FILLER = re.compile(
-        r"\b(automatically|immediately|properly|correctly|successfully|"
-        r"securely|efficiently|seamlessly|dynamically|continuously)\b\s*",
-        re.IGNORECASE,
-    )
-    NUMBER_RE = re.compile(
-        r"\b\d+(?:[.,]\d+)?\s*(?:ms|s|sec(?:ond)?s?|min(?:ute)?s?|hours?|"
-        r"fps|hz|mbps|gbps|kb|mb|gb|%|percent|degrees?|times?|x\b)?",
-        re.IGNORECASE,
-    )
-
     clean = text.strip().rstrip(".")
 
     # 1. Strip leading condition clause: "When/If/Upon ..., "
-    cond = re.match(
-        r"^(?:when|if|upon|after|once)\b[^,]{3,100},\s*", clean, re.IGNORECASE
-    )
+    cond = _GN_COND_RE.match(clean)
     if cond:
         clean = clean[cond.end():]
 
@@ -477,41 +863,30 @@ def generate_name(text: str, modality: str) -> str:
     #    Generic subjects ("the system", "it", "the device", etc.) are dropped.
     #    Domain subjects ("the insulin pump", "the EHR system", etc.) are kept,
     #    abbreviated to avoid repeating parenthetical expansions.
-    GENERIC_SUBJ = re.compile(
-        r"^(?:the\s+(?:system|device|software|application|platform|tool|"
-        r"module|component|interface|server|client|database|product|solution)|it)\s+"
-        r"(?:shall|must|should|will|required\s+to)\s+",
-        re.IGNORECASE,
-    )
-    DOMAIN_SUBJ = re.compile(
-        r"^((?:the\s+)?[\w][\w\s\-]{1,35}?)\s+"
-        r"(?:shall|must|should|will|required\s+to)\s+",
-        re.IGNORECASE,
-    )
-
     subject = ""
-    if GENERIC_SUBJ.match(clean):
-        clean = clean[GENERIC_SUBJ.match(clean).end():]
+    gm = _GN_GENERIC_SUBJ.match(clean)
+    if gm:
+        clean = clean[gm.end():]
     else:
-        dm = DOMAIN_SUBJ.match(clean)
+        dm = _GN_DOMAIN_SUBJ.match(clean)
         if dm:
             raw_subj = dm.group(1).strip()
             # Drop parenthetical expansions like "(EHR)"
             raw_subj = re.sub(r"\s*\(.*?\)", "", raw_subj)
             # Remove leading article
-            raw_subj = _LEADING_ART.sub("", raw_subj).strip()
+            raw_subj = _GN_LEADING_ART.sub("", raw_subj).strip()
             # Keep max 3 words from subject
             subj_words = raw_subj.split()[:3]
             subject = " ".join(subj_words)
             clean = clean[dm.end():]
         else:
             # No modal found — strip just the modal if present mid-sentence
-            mm = re.search(r"\b(?:shall|must|should|will)\b\s*", clean, re.IGNORECASE)
+            mm = _GN_MID_MODAL_RE.search(clean)
             if mm:
                 clean = clean[mm.end():]
 
     # 3. Strip filler adverbs from action phrase
-    clean = _ADVERB_FILLER.sub("", clean).strip()
+    clean = _GN_ADVERB_FILLER.sub("", clean).strip()
 
     # 4. Build candidate = subject + action phrase, tokenise
     candidate = (subject + " " + clean).strip() if subject else clean
@@ -521,19 +896,17 @@ def generate_name(text: str, modality: str) -> str:
     # 5. Find first number within 10 tokens
     num_idx = None
     for idx, tok in enumerate(tokens[:10]):
-        if NUMBER_RE.search(tok):
+        if _GN_NUMBER_UNIT_RE.search(tok):
             num_idx = idx
             break
 
-    _COORD = re.compile(r"^(and|or|but|nor)$", re.IGNORECASE)
-
     if num_idx is not None and num_idx <= 8:
         # Keep up to 4 content words before number + number + optional unit token
         prefix_tokens = []
         for t in tokens[:num_idx]:
-            if _COORD.match(t):
+            if _GN_COORD.match(t):
                 break  # stop at coordinator before the number
-            if not _TRAILING_STOP.match(t):
+            if not _GN_TRAILING_STOP.match(t):
                 prefix_tokens.append(t)
         prefix_tokens = prefix_tokens[:4]
         num_token = tokens[num_idx]
@@ -541,24 +914,22 @@ def generate_name(text: str, modality: str) -> str:
         unit_token = []
         if num_idx + 1 < len(tokens):
             next_tok = tokens[num_idx + 1]
-            if re.match(r"^(?:ms|sec(?:ond)?s?|min(?:ute)?s?|hours?|fps|hz|"
-                        r"mbps|gbps|kb|mb|gb|%|percent|degrees?|times?)$",
-                        next_tok, re.IGNORECASE):
+            if _GN_UNIT_RE.match(next_tok):
                 unit_token = [next_tok]
         name_tokens = prefix_tokens + [num_token] + unit_token
     else:
         # No number — collect up to 6 content words, stop at coordinator
         name_tokens = []
         for t in tokens:
-            if _COORD.match(t):
+            if _GN_COORD.match(t):
                 break
-            if not _TRAILING_STOP.match(t):
+            if not _GN_TRAILING_STOP.match(t):
                 name_tokens.append(t)
             if len(name_tokens) >= 6:
                 break
 
     # 6. Trim trailing stop-words / connectors
-    while name_tokens and _TRAILING_STOP.match(name_tokens[-1]):
+    while name_tokens and _GN_TRAILING_STOP.match(name_tokens[-1]):
         name_tokens.pop()
 
     while name_tokens and name_tokens[-1].lower() in ("and", "or", "with", "to", "the", "a", "an"):
@@ -568,7 +939,7 @@ def generate_name(text: str, modality: str) -> str:
         name_tokens = text.split()[:5]
 
     # 7. Strip leading article from first token
-    first = _LEADING_ART.sub("", name_tokens[0]).strip()
+    first = _GN_LEADING_ART.sub("", name_tokens[0]).strip()
     if first:
         name_tokens[0] = first
 
@@ -631,35 +1002,69 @@ def normalize_input_blocks(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
     return normalized
 
 
-def deduplicate(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    def tokens(text: str) -> set[str]:
-        return set(re.findall(r"\b\w+\b", text.lower()))
+_DUP_JACCARD = 0.75
+# Near-duplicates share almost all tokens, so two sentences at the Jaccard
+# threshold all but certainly share one of each other's rarest tokens.
+# 4 keys keeps the miss probability negligible at this threshold.
+_DUP_RARE_TOKENS = 4
 
-    accepted: List[Dict[str, Any]] = []
-    for result in results:
-        current = tokens(result["sentence"])
+
+def deduplicate(results: List[Result]) -> List[Result]:
+    # Tokenize each sentence exactly once; the old version re-tokenized every
+    # accepted result for every candidate (O(N^2 * L)).
+    signatures = [frozenset(_WORD_RE.findall(r.sentence.lower())) for r in results]
+
+    # Document frequency across all candidates, used to pick each sentence's
+    # most discriminating tokens as its index keys.
+    doc_freq: Dict[str, int] = {}
+    for sig in signatures:
+        for tok in sig:
+            doc_freq[tok] = doc_freq.get(tok, 0) + 1
+
+    # Inverted index: rare token -> indices of accepted results containing it.
+    # Only pairs sharing a rare token get a full Jaccard comparison, instead
+    # of checking every candidate against every accepted result.
+    inverted_index: Dict[str, List[int]] = {}
+    accepted_sigs: Dict[int, frozenset] = {}
+
+    for i, (result, current) in enumerate(zip(results, signatures)):
         duplicate = False
-        for prev in accepted:
-            prev_tokens = tokens(prev["sentence"])
-            if not current or not prev_tokens:
-                continue
-            overlap = len(current & prev_tokens) / len(current | prev_tokens)
-            if overlap >= 0.75:
-                duplicate = True
+        cur_len = len(current)
+        rare = sorted(current, key=lambda t: (doc_freq[t], t))[:_DUP_RARE_TOKENS]
+
+        seen: set = set()
+        for tok in rare:
+            for j in inverted_index.get(tok, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                prev_tokens = accepted_sigs[j]
+                prev_len = len(prev_tokens)
+                # Jaccard is bounded by the size ratio, so wildly different
+                # lengths can never reach the threshold — skip the set ops.
+                if min(cur_len, prev_len) < _DUP_JACCARD * max(cur_len, prev_len):
+                    continue
+                overlap = len(current & prev_tokens) / len(current | prev_tokens)
+                if overlap >= _DUP_JACCARD:
+                    duplicate = True
+                    break
+            if duplicate:
                 break
 
-        result["duplicate"] = duplicate
-        if not duplicate:
-            accepted.append(result)
+        result.duplicate = duplicate
+        if not duplicate and cur_len:
+            accepted_sigs[i] = current
+            for tok in rare:
+                inverted_index.setdefault(tok, []).append(i)
 
     return results
 
 
-def process(payload: Dict[str, Any]) -> Dict[str, Any]:
-    doc_type = str(payload.get("doc_type", "")).strip()
-    entries = normalize_input_blocks(payload)
-    results: List[Dict[str, Any]] = []
-
+def iter_results(entries: List[Dict[str, Any]]) -> Iterator[Result]:
+    """Yield one result dict per accepted requirement candidate."""
+    # Flatten entries into (entry, part) pairs first so spaCy can batch over
+    # every candidate in one nlp.pipe call instead of one doc per sentence.
+    prepared: List[Tuple[Dict[str, Any], str]] = []
     for entry in entries:
         sentence = clean_sentence(str(entry.get("text", "")))
         if not sentence:
@@ -668,107 +1073,155 @@ def process(payload: Dict[str, Any]) -> Dict[str, Any]:
         parts = split_compound(sentence) if CFG.enable_atomic_split else [sentence]
         for part in parts:
             part = normalize_ws(part)
-            if not part:
-                continue
+            if part:
+                prepared.append((entry, part))
 
-            section_title = str(entry.get("section_title", ""))
-            section_ref = str(entry.get("section_ref", ""))
-            section_type = str(entry.get("section_type", "paragraph"))
+    nlp_feats_list: Optional[List[Tuple[bool, bool]]] = None
+    if SPACY_OK and _NLP is not None and CFG.use_spacy:
+        nlp_feats_list = spacy_features([part for _, part in prepared])
 
-            modality = detect_modality(part, CFG)
-            req_id = extract_req_id(part, CFG) or stable_id(part, section_title, section_ref)
-
-            if modality:
-                if is_definitional(part):
-                    continue
-                if is_meta_statement(part):
-                    continue
-                if is_meta_document_statement(part) and not (
-                    SUBJECT_SYSTEM_RE.search(part)
-                    or SUBJECT_CONTRACT_RE.search(part)
-                    or SUBJECT_COMPONENT_RE.search(part)
-                ):
-                    continue
+    for idx, (entry, part) in enumerate(prepared):
+        section_title = str(entry.get("section_title", ""))
+        section_ref = str(entry.get("section_ref", ""))
+        section_type = str(entry.get("section_type", "paragraph"))
 
-                raw_score, feats = score_modal(part, modality, entry, CFG)
-                if raw_score < CFG.min_accept_score:
-                    continue
+        modality = detect_modality(part, CFG)
+        flags = feature_flags(part)
 
-                confidence_score = score_to_confidence(raw_score, CFG.min_accept_score)
-                confidence = confidence_label(raw_score, CFG.min_accept_score)
-                classification = classify(part, entry)
-                flags = list(feats.keys())
-                if modality == "will":
-                    flags.append("will_obligation")
-
-                results.append(
-                    {
-                        "sentence": part,
-                        "name": generate_name(part, modality),
-                        "score": normalize_ui_score(raw_score, CFG.min_accept_score),
-                        "confidence": confidence,
-                        "confidence_score": round(confidence_score, 3),
-                        "flags": sorted(set(flags)),
-                        "classification": classification,
-                        "req_id": req_id,
-                        "section_title": section_title,
-                        "section_ref": section_ref,
-                        "section_type": section_type,
-                        "duplicate": False,
-                    }
-                )
+        if modality:
+            if is_definitional(part):
                 continue
-
-            if not CFG.enable_non_modal_constraints:
+            if is_meta_statement(part):
                 continue
-            if TABLE_FIGURE_TITLE_RE.match(part):
+            if is_meta_document_statement(part) and not flags & _F_SUBJ_ANY:
                 continue
 
-            in_mode_region = bool(MODE_SECTION_RE.search(section_title))
-            candidate = (
-                STRUCTURED_LINE_RE.match(part)
-                or MEASURE_RE.search(part)
-                or CONSTRAINT_WORD_RE.search(part)
-                or (in_mode_region and MODE_WORD_RE.search(part))
+            raw_score, feat_bits = score_modal(
+                part,
+                flags,
+                modality,
+                entry,
+                CFG,
+                nlp_feats_list[idx] if nlp_feats_list else None,
             )
-            if not candidate:
+            if raw_score < CFG.min_accept_score:
                 continue
 
-            raw_score, feats = score_non_modal(part, entry)
-            if raw_score < CFG.min_non_modal_score:
-                continue
+            # Most sentences are rejected above, so only accepted ones pay
+            # for the ID extraction / hash.
+            req_id = extract_req_id(part, CFG) or stable_id(part, section_title, section_ref)
+            classification = classify(flags, entry)
+
+            yield Result(
+                sentence=part,
+                name=generate_name(part, modality),
+                score=0.0,
+                confidence="",
+                confidence_score=0.0,
+                flags=_flags_from_bits(
+                    feat_bits, "will_obligation" if modality == "will" else None
+                ),
+                classification=classification,
+                req_id=req_id,
+                section_title=section_title,
+                section_ref=section_ref,
+                section_type=section_type,
+                raw_score=raw_score,
+                threshold=CFG.min_accept_score,
+            )
+            continue
 
-            if in_mode_region:
-                classification = "constraint"
-            elif MEASURE_RE.search(part) or CONSTRAINT_WORD_RE.search(part):
-                classification = "constraint"
-            else:
-                classification = classify(part, entry)
+        if not CFG.enable_non_modal_constraints:
+            continue
+        if TABLE_FIGURE_TITLE_RE.match(part):
+            continue
 
-            confidence_score = score_to_confidence(raw_score, CFG.min_non_modal_score)
-            confidence = confidence_label(raw_score, CFG.min_non_modal_score)
-            flags = list(feats.keys()) + ["implicit_constraint"]
+        in_mode_region = bool(MODE_SECTION_RE.search(section_title))
+        candidate = (
+            STRUCTURED_LINE_RE.match(part)
+            or flags & (_F_MEASURE | _F_CONSTRAINT)
+            or (in_mode_region and flags & _F_MODE_WORD)
+        )
+        if not candidate:
+            continue
+
+        raw_score, feat_bits = score_non_modal(part, flags, entry)
+        if raw_score < CFG.min_non_modal_score:
+            continue
+
+        req_id = extract_req_id(part, CFG) or stable_id(part, section_title, section_ref)
+
+        if in_mode_region:
+            classification = "constraint"
+        elif flags & (_F_MEASURE | _F_CONSTRAINT):
+            classification = "constraint"
+        else:
+            classification = classify(flags, entry)
+
+        yield Result(
+            sentence=part,
+            name=generate_name(part, "implicit"),
+            score=0.0,
+            confidence="",
+            confidence_score=0.0,
+            flags=_flags_from_bits(feat_bits, "implicit_constraint"),
+            classification=classification,
+            req_id=req_id,
+            section_title=section_title,
+            section_ref=section_ref,
+            section_type=section_type,
+            raw_score=raw_score,
+            threshold=CFG.min_non_modal_score,
+        )
 
-            results.append(
-                {
-                    "sentence": part,
-                    "name": generate_name(part, "implicit"),
-                    "score": normalize_ui_score(raw_score, CFG.min_non_modal_score),
-                    "confidence": confidence,
-                    "confidence_score": round(confidence_score, 3),
-                    "flags": sorted(set(flags)),
-                    "classification": classification,
-                    "req_id": req_id,
-                    "section_title": section_title,
-                    "section_ref": section_ref,
-                    "section_type": section_type,
-                    "duplicate": False,
-                }
-            )
 
-    results.sort(key=lambda r: r["score"], reverse=True)
+def process(payload: Dict[str, Any]) -> Dict[str, Any]:
+    doc_type = str(payload.get("doc_type", "")).strip()
+    entries = normalize_input_blocks(payload)
+    results = list(iter_results(entries))
+    for result in results:
+        finalize_result(result)
+    results.sort(key=lambda r: r.score, reverse=True)
     results = deduplicate(results)
-    return {"results": results, "spacy_available": SPACY_OK, "doc_type": doc_type}
+    return {
+        "results": [_result_to_dict(r) for r in results],
+        "spacy_available": SPACY_OK,
+        "doc_type": doc_type,
+    }
+
+
+def process_streaming(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield protocol objects for the streaming mode, one per output line.
+
+    Results are emitted as produced (no global sort); duplicates are flagged
+    online against the results already emitted, so the caller never waits for
+    the whole document to finish.
+    """
+    doc_type = str(payload.get("doc_type", "")).strip()
+    entries = normalize_input_blocks(payload)
+
+    accepted_sigs: List[frozenset] = []
+    for result in iter_results(entries):
+        finalize_result(result)
+        current = frozenset(_WORD_RE.findall(result.sentence.lower()))
+        duplicate = False
+        cur_len = len(current)
+        for prev_tokens in accepted_sigs:
+            prev_len = len(prev_tokens)
+            if not cur_len or not prev_len:
+                continue
+            if min(cur_len, prev_len) < _DUP_JACCARD * max(cur_len, prev_len):
+                continue
+            if len(current & prev_tokens) / len(current | prev_tokens) >= _DUP_JACCARD:
+                duplicate = True
+                break
+
+        result.duplicate = duplicate
+        if not duplicate:
+            accepted_sigs.append(current)
+        yield {"result": _result_to_dict(result)}
+
+    yield {"done": True, "spacy_available": SPACY_OK, "doc_type": doc_type}
 
 
 def main() -> None:
@@ -778,14 +1231,18 @@ def main() -> None:
         if not line:
             continue
         try:
-            payload = json.loads(line)
-            output = process(payload)
-            print(json.dumps(output), flush=True)
-        except json.JSONDecodeError as exc:
-            print(json.dumps({"error": f"JSON parse error: {exc}"}), flush=True)
+            payload = _loads(line)
+            if payload.get("streaming"):
+                for obj in process_streaming(payload):
+                    _write_line(obj)
+            else:
+                _write_line(process(payload))
+        except ValueError as exc:
+            # Covers both json.JSONDecodeError and orjson.JSONDecodeError.
+            _write_line({"error": f"JSON parse error: {exc}"})
         except Exception as exc:
             logging.exception("Unhandled error")
-            print(json.dumps({"error": str(exc)}), flush=True)
+            _write_line({"error": str(exc)})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Launch the simulation engine under PyPy when available.
+#
+# The engine is a long-lived loop of JSON-line parsing plus SimPy generator
+# dispatch — dict/generator-heavy Python that PyPy's tracing JIT speeds up
+# substantially with no code changes (SimPy is pure Python, so nothing gates
+# the import). Expect the JIT to warm up over the first few hundred events;
+# long scenarios amortize this. CPython remains the fallback.
+
+HERE="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+if command -v pypy3 >/dev/null 2>&1; then
+  exec pypy3 "$HERE/simulation_engine.py" "$@"
+fi
+
+exec python3 "$HERE/simulation_engine.py" "$@"
@@ -21,21 +21,33 @@ stdout: one JSON line:
         }
 
 stderr: diagnostic log messages only (never parsed by caller)
+
+Long scenarios may set "streaming": true on the payload, in which case
+timeline events are emitted as they happen, one JSON line each, followed
+by a terminal summary line:
+        { "type": "event", "timestamp_ms", "block_id", "event_type", "detail" }
+        ...
+        { "type": "summary", "status", "metrics", "errors" }
+The default (batch) protocol is unchanged.
 """
 
 from __future__ import annotations
 
+import ast
+import copy
 import json
 import logging
 import sys
 import traceback
-from typing import Any, Dict, List, Optional
+from collections import deque
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional
 
 # ── UTF-8 everywhere ──────────────────────────────────────────────────────────
+# stdin is consumed as raw bytes in main() (the JSON parsers accept bytes
+# directly), so only the text-mode output streams need reconfiguring.
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-if hasattr(sys.stdin, "reconfigure"):
-    sys.stdin.reconfigure(encoding="utf-8", errors="replace")
 if hasattr(sys.stderr, "reconfigure"):
     sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 
@@ -45,6 +57,38 @@ logging.basicConfig(
     format="[simulation_engine] %(levelname)s %(message)s",
 )
 
+# ── Optional fast JSON codec ──────────────────────────────────────────────────
+# Best-effort, in preference order: orjson (Rust), then msgspec (C, with
+# persistent decoder/encoder instances reused across requests), then stdlib
+# json with one shared compact encoder. Large project_json payloads and
+# timeline dumps dominate the protocol cost, so this is worth the ladder.
+try:
+    import orjson
+
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec.json
+
+        _dumps_bytes = msgspec.json.Encoder().encode
+        _loads = msgspec.json.Decoder().decode
+    except ImportError:
+        _json_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+        def _dumps_bytes(obj: Any) -> bytes:
+            return _json_encode(obj).encode("utf-8")
+
+        _loads = json.loads
+
+
+def _write_line(obj: Any) -> None:
+    out = sys.stdout.buffer
+    out.write(_dumps_bytes(obj))
+    out.write(b"\n")
+    out.flush()
+
+
 # ── Optional SimPy ────────────────────────────────────────────────────────────
 try:
     import simpy
@@ -59,153 +103,337 @@ except ImportError:
     )
 
 
+# Optional NumPy (best-effort): only used to pre-generate failure draws in
+# bulk, which amortizes the per-call cost of drawing one uniform at a time.
+try:
+    import numpy as _np
+except ImportError:
+    _np = None  # type: ignore
+
+
+def _event_dict(
+    ts: float, bid: str, etype: str, arg: Any, elapsed: float
+) -> Dict[str, Any]:
+    """Materialize one timeline event row.
+
+    The "detail" string is formatted here, at output time — the old code
+    paid the f-string on every event inside the simulation loop.
+    """
+    event: Dict[str, Any] = {"timestamp_ms": ts, "block_id": bid, "event_type": etype}
+    if etype == "stimulus":
+        event["detail"] = f"signal={arg}"
+    else:
+        # Integer formatting of tenths-of-ms; the ".1f" float-to-decimal
+        # path is markedly slower and this runs once per event.
+        e10 = round(elapsed * 10)
+        verb = "done in" if etype == "processed" else "failed after"
+        event["detail"] = f"item {arg} {verb} {e10 // 10}.{e10 % 10}ms"
+    return event
+
+
+def _compile_scripts(block_behaviors: Dict) -> Dict[str, Any]:
+    """Specialize each block's sim_script into a plain function, keyed by
+    block_id.
+
+    The script body is parsed once and grafted into
+    ``def _script_fn(item, params, env_now, result)``; the hot loop then
+    makes a normal function call with fast locals instead of paying exec()'s
+    fresh-namespace setup per item. A trailing ``return result`` is appended
+    so scripts that rebind ``result`` (instead of mutating it in place, the
+    documented pattern) still work. Blocks whose script fails to compile are
+    logged and stored as None — script present but broken — so the engine
+    reproduces the old per-exec failure outcome (never failed, default
+    processing time) instead of treating the block as script-less and
+    applying its failure_rate.
+    """
+    template = ast.parse("def _script_fn(item, params, env_now, result):\n    pass")
+    compiled: Dict[str, Any] = {}
+    for block_id, behavior in block_behaviors.items():
+        script = (behavior or {}).get("sim_script")
+        if not script:
+            continue
+        try:
+            func_def = copy.deepcopy(template.body[0])
+            func_def.body = ast.parse(script).body + [
+                ast.Return(value=ast.Name(id="result", ctx=ast.Load()))
+            ]
+            wrapped = ast.Module(body=[func_def], type_ignores=[])
+            ast.fix_missing_locations(wrapped)
+            namespace: Dict[str, Any] = {}
+            exec(compile(wrapped, f"<sim_script:{block_id}>", "exec"), namespace)
+            compiled[block_id] = namespace["_script_fn"]
+        except SyntaxError as exc:
+            logging.warning("Block %s script compile error: %s", block_id, exc)
+            compiled[block_id] = None
+    return compiled
+
+
+class _FifoQueue:
+    """Minimal FIFO channel for blocks drained by one consumer process.
+
+    SimPy's Store supports arbitrary consumers, filters and put-side events;
+    this workload only needs capacity-checked FIFO put/get with exactly one
+    consumer per block, so the Store's per-transfer event machinery is
+    skipped: put is a plain deque append (or a direct hand-off when the
+    consumer is waiting) and get allocates one event only when the queue is
+    empty. Any number of producers is fine — only the consumer ever parks a
+    waiter. Exposes the same .items/.capacity/.put/.get surface the engine
+    uses.
+    """
+
+    __slots__ = ("env", "items", "capacity", "_waiter")
+
+    def __init__(self, env: Any, capacity: int) -> None:
+        self.env = env
+        self.items: deque = deque()
+        self.capacity = capacity
+        self._waiter: Optional[Any] = None
+
+    def put(self, item: Any) -> None:
+        # Callers check capacity before putting, mirroring the Store usage.
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            waiter.succeed(item)
+        else:
+            self.items.append(item)
+
+    def get(self) -> Any:
+        event = self.env.event()
+        if self.items:
+            event.succeed(self.items.popleft())
+        else:
+            self._waiter = event
+        return event
+
+
 # ── SimPy discrete event simulation ──────────────────────────────────────────
 
 def run_with_simpy(
     project_json: Dict,
     scenario: Dict,
     block_behaviors: Dict,
+    event_sink: Optional[Callable[[Dict], None]] = None,
 ) -> Dict:
-    """Full discrete event simulation using SimPy."""
+    """Full discrete event simulation using SimPy.
+
+    When event_sink is given, timeline events are handed to it as they
+    occur instead of being accumulated, and the returned timeline is empty.
+    """
     import simpy as sp
     import random
 
     duration_ms: float = float(scenario.get("duration_ms") or 10000)
-    timeline: List[Dict] = []
+
+    # Timeline as parallel arrays (columnar) rather than a list of dicts:
+    # appends are scalar list ops with no per-event dict allocation, and rows
+    # are materialized once at the end. Streaming hands rows straight to the
+    # sink instead.
+    _ts: List[float] = []
+    _bid: List[str] = []
+    _etype: List[str] = []
+    _arg: List[Any] = []
+    _elapsed: List[float] = []
+
+    if event_sink is None:
+        def record(ts: float, bid: str, etype: str, arg: Any, elapsed: float) -> None:
+            _ts.append(ts)
+            _bid.append(bid)
+            _etype.append(etype)
+            _arg.append(arg)
+            _elapsed.append(elapsed)
+    else:
+        def record(ts: float, bid: str, etype: str, arg: Any, elapsed: float) -> None:
+            event_sink(_event_dict(ts, bid, etype, arg, elapsed))
 
     nodes: List[Dict] = project_json.get("nodes") or []
     edges: List[Dict] = project_json.get("edges") or []
 
-    block_nodes = {n["id"]: n for n in nodes if n.get("kind") == "block"}
+    # Only the block ids are ever used (iteration plus the downstream-dict
+    # membership test below); keeping the node dicts alive here just pinned
+    # memory. dict.fromkeys dedupes while preserving node order so metrics
+    # output stays deterministic.
+    block_ids = list(dict.fromkeys(n["id"] for n in nodes if n.get("kind") == "block"))
+    compiled_scripts = _compile_scripts(block_behaviors)
 
     env = sp.Environment()
 
-    # One SimPy Store per block (acts as input queue)
+    # One queue per block (acts as input queue). Every block is drained by
+    # exactly one process, so the lightweight channel is safe regardless of
+    # fan-in; scenarios can set "use_simpy_store": true to fall back to the
+    # general SimPy Store for comparison.
+    use_simpy_store = bool(scenario.get("use_simpy_store"))
     block_stores: Dict[str, Any] = {}
-    for block_id, _ in block_nodes.items():
+    for block_id in block_ids:
         behavior = block_behaviors.get(block_id) or {}
         params = behavior.get("sim_params") or {}
         capacity = int(params.get("queue_capacity") or 100)
-        block_stores[block_id] = sp.Store(env, capacity=capacity)
+        if use_simpy_store:
+            block_stores[block_id] = sp.Store(env, capacity=capacity)
+        else:
+            block_stores[block_id] = _FifoQueue(env, capacity)
 
     # Per-block accumulators
     block_counters: Dict[str, Dict] = {
         bid: {"processed": 0, "failures": 0, "busy_time": 0.0}
-        for bid in block_nodes
+        for bid in block_ids
     }
 
+    # Downstream adjacency, resolved once: the old code scanned every edge on
+    # every processed item. Each entry is (store, capacity) so the hot path
+    # does neither a store lookup nor a capacity attribute read.
+    downstream: Dict[str, List[Any]] = {bid: [] for bid in block_ids}
+    for edge in edges:
+        if edge.get("kind") != "connects":
+            continue
+        source_id = edge.get("source_id")
+        target_id = edge.get("target_id")
+        if source_id in downstream and target_id in block_stores:
+            target_store = block_stores[target_id]
+            downstream[source_id].append((target_store, target_store.capacity))
+
     def block_process(env: Any, block_id: str, store: Any) -> Any:
         behavior = block_behaviors.get(block_id) or {}
         params = behavior.get("sim_params") or {}
-        script: Optional[str] = behavior.get("sim_script")
-
-        processing_time_ms = float(params.get("processing_time_ms") or 100.0)
+        script = compiled_scripts.get(block_id)
+        # None means "script present but broken": such blocks must behave
+        # like the old per-exec failure path (failed=False, default time),
+        # not like script-less blocks with a live failure_rate.
+        script_present = block_id in compiled_scripts
+
+        # "or 100.0" would coerce an explicit 0 (a pure routing block) to the
+        # default; only a missing value falls back.
+        pt_raw = params.get("processing_time_ms")
+        processing_time_ms = float(pt_raw) if pt_raw is not None else 100.0
         failure_rate = float(params.get("failure_rate") or 0.0)
 
+        # Failure draws only matter for script-less blocks with a non-zero
+        # rate; those draw from a refillable pool of 10k uniforms when NumPy
+        # is available instead of calling random.random() per item.
+        draw_failures = failure_rate > 0.0 and not script_present
+        rng_pool = None
+        rng_idx = 0
+
+        # Pure routing/logic blocks (static zero processing time, no script)
+        # skip the env.timeout() below entirely — a timeout(0) still costs a
+        # heap insert and wakeup through SimPy's event queue per item.
+        zero_proc = processing_time_ms == 0.0 and not script_present
+
+        # Bind every hot name to a function local: closure/global reads are
+        # LOAD_DEREF/LOAD_GLOBAL plus (for methods) an attribute lookup per
+        # access, while locals are single-indexed LOAD_FASTs.
+        counter = block_counters[block_id]
+        block_downstream = downstream[block_id]
+        record_event = record
+        get_item = store.get
+        timeout = env.timeout
+
+        # One result dict reused across items; its fields are reset before
+        # every script call. Scripts needing cross-item state can use
+        # ``global`` names, which live in the script's own namespace.
+        script_result: Dict = {"failed": False, "processing_time_ms": processing_time_ms}
+
         item_seq = 0
         while True:
             try:
-                item = yield store.get()
+                item = yield get_item()
                 item_seq += 1
                 start = env.now
 
                 if script:
-                    # Execute user-provided script in a sandboxed local context
-                    local_ctx: Dict = {
-                        "item": item,
-                        "params": params,
-                        "env_now": env.now,
-                        "result": {
-                            "failed": False,
-                            "processing_time_ms": processing_time_ms,
-                        },
-                    }
+                    # Call the specialized script function (sandboxed context)
+                    script_result["failed"] = False
+                    script_result["processing_time_ms"] = processing_time_ms
                     try:
-                        exec(script, {}, local_ctx)  # noqa: S102
-                        failed = bool(local_ctx["result"].get("failed", False))
+                        result_out = script(item, params, env.now, script_result)
+                        if not isinstance(result_out, dict):
+                            # Script hit a bare early return; the reusable
+                            # dict holds whatever it mutated so far.
+                            result_out = script_result
+                        failed = bool(result_out.get("failed", False))
                         proc_time = float(
-                            local_ctx["result"].get("processing_time_ms", processing_time_ms)
+                            result_out.get("processing_time_ms", processing_time_ms)
                         )
                     except Exception as exc:
                         logging.warning("Block %s script error: %s", block_id, exc)
                         failed = False
                         proc_time = processing_time_ms
+                elif draw_failures:
+                    if _np is not None:
+                        if rng_pool is None or rng_idx >= len(rng_pool):
+                            rng_pool = _np.random.random(10000)
+                            rng_idx = 0
+                        failed = bool(rng_pool[rng_idx] < failure_rate)
+                        rng_idx += 1
+                    else:
+                        failed = random.random() < failure_rate
+                    proc_time = processing_time_ms
                 else:
-                    failed = random.random() < failure_rate
+                    failed = False
                     proc_time = processing_time_ms
 
-                yield env.timeout(proc_time)
-                elapsed = env.now - start
-                block_counters[block_id]["busy_time"] += elapsed
+                if zero_proc:
+                    elapsed = 0.0
+                else:
+                    yield timeout(proc_time)
+                    elapsed = env.now - start
+                    counter["busy_time"] += elapsed
 
                 if failed:
-                    block_counters[block_id]["failures"] += 1
-                    timeline.append(
-                        {
-                            "timestamp_ms": env.now,
-                            "block_id": block_id,
-                            "event_type": "failure",
-                            "detail": f"item {item_seq} failed after {elapsed:.1f}ms",
-                        }
-                    )
+                    counter["failures"] += 1
+                    record_event(env.now, block_id, "failure", item_seq, elapsed)
                 else:
-                    block_counters[block_id]["processed"] += 1
-                    timeline.append(
-                        {
-                            "timestamp_ms": env.now,
-                            "block_id": block_id,
-                            "event_type": "processed",
-                            "detail": f"item {item_seq} done in {elapsed:.1f}ms",
-                        }
-                    )
+                    counter["processed"] += 1
+                    record_event(env.now, block_id, "processed", item_seq, elapsed)
                     # Forward output to downstream blocks via 'connects' edges
-                    for edge in edges:
-                        if (
-                            edge.get("kind") == "connects"
-                            and edge.get("source_id") == block_id
-                            and edge.get("target_id") in block_stores
-                        ):
-                            target_store = block_stores[edge["target_id"]]
-                            if len(target_store.items) < target_store.capacity:
-                                target_store.put(item_seq)
+                    for target_store, target_capacity in block_downstream:
+                        if len(target_store.items) < target_capacity:
+                            target_store.put(item_seq)
 
             except sp.Interrupt:
                 break
 
-    def event_injector(env: Any) -> Any:
-        events = sorted(scenario.get("events") or [], key=lambda e: float(e.get("time_ms") or 0))
-        for ev in events:
-            target_time = float(ev.get("time_ms") or 0)
+    def event_injector(env: Any, prepared_events: List[tuple]) -> Any:
+        for target_time, target_id, signal, value in prepared_events:
             delay = max(0.0, target_time - env.now)
             yield env.timeout(delay)
-            target_id = ev.get("block_id") or ev.get("target_id")
             if target_id and target_id in block_stores:
                 store = block_stores[target_id]
                 if len(store.items) < store.capacity:
-                    store.put({"signal": ev.get("signal_type", "trigger"), "value": ev.get("value")})
-                    timeline.append(
-                        {
-                            "timestamp_ms": env.now,
-                            "block_id": target_id,
-                            "event_type": "stimulus",
-                            "detail": f"signal={ev.get('signal_type', 'trigger')}",
-                        }
-                    )
+                    store.put({"signal": signal, "value": value})
+                    record(env.now, target_id, "stimulus", signal, 0.0)
 
     # Launch all block processes
     for bid, store in block_stores.items():
         env.process(block_process(env, bid, store))
 
-    # Launch stimulus injector
+    # Launch stimulus injector. Events are flattened to sorted
+    # (time, target, signal, value) tuples up front so the injector loop
+    # does no dict lookups per event.
     scenario_events = scenario.get("events") or []
     if scenario_events:
-        env.process(event_injector(env))
+        prepared_events = [
+            (
+                float(ev.get("time_ms") or 0),
+                ev.get("block_id") or ev.get("target_id"),
+                ev.get("signal_type", "trigger"),
+                ev.get("value"),
+            )
+            for ev in scenario_events
+        ]
+        # Callers usually send events already ordered by time; a linear
+        # short-circuiting check beats running the sort key n log n times.
+        if any(
+            a[0] > b[0] for a, b in zip(prepared_events, prepared_events[1:])
+        ):
+            prepared_events.sort(key=itemgetter(0))
+        env.process(event_injector(env, prepared_events))
 
     env.run(until=duration_ms)
 
     # Build per-block metrics
     metrics: Dict[str, Dict] = {}
-    for block_id in block_nodes:
+    for block_id in block_ids:
         c = block_counters[block_id]
         util = c["busy_time"] / duration_ms if duration_ms > 0 else 0.0
         metrics[block_id] = {
@@ -215,6 +443,10 @@ def run_with_simpy(
             "failures": c["failures"],
         }
 
+    timeline = [
+        _event_dict(ts, bid, etype, arg, elapsed)
+        for ts, bid, etype, arg, elapsed in zip(_ts, _bid, _etype, _arg, _elapsed)
+    ]
     return {"status": "complete", "metrics": metrics, "timeline": timeline, "errors": []}
 
 
@@ -234,17 +466,55 @@ def run_deterministic(
         "Install with: pip install simpy"
     ]
 
+    rows = []
     for node in nodes:
         if node.get("kind") != "block":
             continue
         block_id = node["id"]
         behavior = block_behaviors.get(block_id) or {}
         params = behavior.get("sim_params") or {}
+        pt_raw = params.get("processing_time_ms")
+        rows.append(
+            (
+                block_id,
+                float(pt_raw) if pt_raw is not None else 100.0,
+                float(params.get("failure_rate") or 0.0),
+                params.get("throughput_per_sec"),
+            )
+        )
 
-        processing_time_ms = float(params.get("processing_time_ms") or 100.0)
-        failure_rate = float(params.get("failure_rate") or 0.0)
-        throughput_per_sec = params.get("throughput_per_sec")
-
+    # The per-block math is bulk scalar arithmetic, so large projects go
+    # through numpy in a handful of array ops. Small ones keep the plain
+    # loop — below ~50 blocks the array setup outweighs the win.
+    if _np is not None and len(rows) >= 50:
+        pt = _np.array([r[1] for r in rows])
+        fr = _np.array([r[2] for r in rows])
+        tp = _np.array([float(r[3]) if r[3] else _np.nan for r in rows])
+
+        has_tp = ~_np.isnan(tp)
+        by_pt = _np.where(pt > 0, duration_ms / _np.where(pt > 0, pt, 1.0), 0.0)
+        processed = _np.where(has_tp, tp * (duration_ms / 1000.0), by_pt).astype(_np.int64)
+        failures = (processed * fr).astype(_np.int64)
+        # Keep util unrounded here: np.round and builtin round() can differ
+        # on representation-boundary values, and the scalar loop below uses
+        # round(), so the final rounding happens per element in the zip-back.
+        util = (
+            _np.minimum(pt * processed / duration_ms, 1.0)
+            if duration_ms > 0
+            else _np.zeros(len(rows))
+        )
+        survivors = _np.maximum(processed - failures, 0)
+
+        for i, (block_id, _, _, _) in enumerate(rows):
+            metrics[block_id] = {
+                "utilization": round(float(util[i]), 4),
+                "queue_depth": 0,
+                "processed_count": int(survivors[i]),
+                "failures": int(failures[i]),
+            }
+        return {"status": "complete", "metrics": metrics, "timeline": [], "errors": errors}
+
+    for block_id, processing_time_ms, failure_rate, throughput_per_sec in rows:
         if throughput_per_sec:
             processed = int(float(throughput_per_sec) * (duration_ms / 1000.0))
         elif processing_time_ms > 0:
@@ -288,40 +558,94 @@ def process(payload: Dict) -> Dict:
         }
 
 
+def process_streaming(payload: Dict) -> Dict:
+    """Run the simulation, writing timeline events as NDJSON lines.
+
+    Events are flushed in batches so a long run neither holds the full
+    timeline in memory nor issues one write per event. Returns the summary
+    line for main() to emit after the last event batch.
+    """
+    project_json = payload.get("project_json") or {}
+    scenario = payload.get("scenario") or {}
+    block_behaviors = payload.get("block_behaviors") or {}
+
+    batch: List[Dict] = []
+
+    def flush() -> None:
+        if batch:
+            out = sys.stdout.buffer
+            out.write(b"\n".join(map(_dumps_bytes, batch)) + b"\n")
+            out.flush()
+            batch.clear()
+
+    def emit(event: Dict) -> None:
+        batch.append({"type": "event", **event})
+        if len(batch) >= 256:
+            flush()
+
+    try:
+        if SIMPY_OK:
+            result = run_with_simpy(project_json, scenario, block_behaviors, event_sink=emit)
+        else:
+            result = run_deterministic(project_json, scenario, block_behaviors)
+    except Exception as exc:
+        logging.exception("Simulation failed")
+        flush()
+        return {
+            "type": "summary",
+            "status": "error",
+            "metrics": {},
+            "errors": [str(exc), traceback.format_exc()],
+        }
+
+    flush()
+    return {
+        "type": "summary",
+        "status": result["status"],
+        "metrics": result["metrics"],
+        "errors": result["errors"],
+    }
+
+
 def main() -> None:
     logging.info("simulation_engine ready")
-    for line in sys.stdin:
+    # Read raw bytes: iterating text-mode sys.stdin would UTF-8-decode every
+    # byte into a str that the JSON parser immediately re-encodes; all codec
+    # tiers accept bytes natively.
+    stdin = sys.stdin.buffer
+    while True:
+        line = stdin.readline()
+        if not line:
+            break
         line = line.strip()
         if not line:
             continue
         try:
-            payload = json.loads(line)
-            output = process(payload)
-            print(json.dumps(output), flush=True)
-        except json.JSONDecodeError as exc:
-            print(
-                json.dumps(
-                    {
-                        "status": "error",
-                        "metrics": {},
-                        "timeline": [],
-                        "errors": [f"JSON parse error: {exc}"],
-                    }
-                ),
-                flush=True,
+            payload = _loads(line)
+            if payload.get("streaming"):
+                output = process_streaming(payload)
+            else:
+                output = process(payload)
+            _write_line(output)
+        except ValueError as exc:
+            # Covers stdlib json.JSONDecodeError and orjson.JSONDecodeError.
+            _write_line(
+                {
+                    "status": "error",
+                    "metrics": {},
+                    "timeline": [],
+                    "errors": [f"JSON parse error: {exc}"],
+                }
             )
         except Exception as exc:
             logging.exception("Unhandled error")
-            print(
-                json.dumps(
-                    {
-                        "status": "error",
-                        "metrics": {},
-                        "timeline": [],
-                        "errors": [str(exc)],
-                    }
-                ),
-                flush=True,
+            _write_line(
+                {
+                    "status": "error",
+                    "metrics": {},
+                    "timeline": [],
+                    "errors": [str(exc)],
+                }
             )
 
 